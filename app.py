@@ -1,15 +1,53 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from scipy.stats import ttest_ind
+from scipy.stats import t as t_dist
 import plotly.express as px
-import yaml, json, io, zipfile
+import plotly.graph_objects as go
+import yaml, json, io, re, zipfile, warnings
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # optional, see requirements.txt
+    pa = pacsv = None
+
+try:
+    import numba
+except ImportError:  # optional, see requirements.txt
+    numba = None
+
 # ---- Utility: File Handlers and Config ----
-@st.cache_data
-def read_matrix(file):
-    return pd.read_csv(file, sep='\t', low_memory=False)
+# Quantity columns in a DIA-NN matrix: A01/B01-style names or raw-file paths
+SAMPLE_COL_PATTERN = re.compile(r'^[AB]\d+$|\.(raw|d|mzml|wiff|dia)$', re.IGNORECASE)
+
+@st.cache_data(show_spinner=False, ttl=24*60*60, max_entries=4)
+def read_matrix(path, mtime):
+    # mtime is only part of the cache key: a rewritten matrix is re-parsed
+    df = None
+    if pacsv is not None:
+        with open(path, encoding='utf-8') as fh:
+            header = fh.readline().rstrip('\r\n').split('\t')
+        # Typing sample columns up front parses them straight to float32 and stops
+        # Arrow from inferring a sparse column as null from its first block
+        column_types = {c: pa.float32() for c in header if SAMPLE_COL_PATTERN.search(c)}
+        try:
+            table = pacsv.read_csv(
+                path,
+                parse_options=pacsv.ParseOptions(delimiter='\t'),
+                convert_options=pacsv.ConvertOptions(column_types=column_types),
+            )
+            df = table.to_pandas()
+        except pa.ArrowInvalid:
+            # Arrow infers column types from the first block; let pandas handle mixed columns
+            pass
+    if df is None:
+        df = pd.read_csv(path, sep='\t', low_memory=False)
+    # Intensities don't need float64; float32 halves memory for every later pass
+    floats = df.select_dtypes('float64').columns
+    df[floats] = df[floats].astype('float32')
+    return df
 
 def find_matrix_files(folder):
     files = list(Path(folder).glob("*.tsv"))
@@ -31,84 +69,150 @@ def load_config(uploaded, file_type):
 
 def zip_results(dict_of_files):
     buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w") as zf:
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
         for fname, fdata in dict_of_files.items():
-            zf.writestr(fname, fdata)
+            if isinstance(fdata, pd.DataFrame):
+                # Stream tables into the archive instead of building the whole TSV text first
+                with io.TextIOWrapper(zf.open(fname, "w"), encoding="utf-8", newline="") as fh:
+                    fdata.to_csv(fh, sep="\t", index=False)
+            else:
+                zf.writestr(fname, fdata)
     buf.seek(0)
     return buf
 
 # ---- Synthetic Data Demo Mode ----
+@st.cache_data(show_spinner=False)
 def generate_synthetic_data(species_params, n_proteins=2000, n_reps=3, noise=0.13):
-    np.random.seed(42)
-    species_ids = {"HUMAN":0,"YEAST":1,"ECOLI":2,"CELEGANS":3}
-    base = []
-    for sp, fc in species_params.items():
-        for i in range(n_proteins//len(species_params)):
-            row = {
-                "Protein.Group": f"P{sp}{i+1}",
-                "Protein.Names": f"{sp}_dummy{i+1}",
-            }
-            a_vals = np.random.normal(20, noise, n_reps)
-            b_vals = a_vals + fc
-            for j in range(n_reps):
-                row[f"A{j+1:02d}"] = 2**a_vals[j]
-                row[f"B{j+1:02d}"] = 2**b_vals[j]
-            base.append(row)
+    rng = np.random.default_rng(42)
+    per_sp = n_proteins//len(species_params)
+    species = np.repeat(list(species_params.keys()), per_sp)
+    idx = np.tile(np.arange(1, per_sp+1).astype(str), len(species_params))
+    # log2 intensities for all proteins at once; B is shifted by its species' log2FC
+    a_vals = rng.normal(20, noise, size=(species.size, n_reps))
+    b_vals = a_vals + np.repeat(list(species_params.values()), per_sp)[:, None]
+    np.exp2(a_vals, out=a_vals)
+    np.exp2(b_vals, out=b_vals)
+    base = {
+        "Protein.Group": np.char.add(np.char.add("P", species), idx),
+        "Protein.Names": np.char.add(np.char.add(species, "_dummy"), idx),
+    }
+    for j in range(n_reps):
+        base[f"A{j+1:02d}"] = a_vals[:, j]
+        base[f"B{j+1:02d}"] = b_vals[:, j]
     return pd.DataFrame(base)
 
-# ---- Preprocessing / Filtering ----
-def assign_species(row, species_suffixes):
-    matches = [sp for sp,suf in species_suffixes.items() if suf in row['Protein.Names']]
-    return matches[0] if matches else 'MIXED'
+# ---- Row Statistics ----
+def _row_stats_numpy(X):
+    with warnings.catch_warnings():
+        # All-NaN rows / single-value rows give NaN mean / variance
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return (~np.isnan(X)).sum(axis=1), np.nanmean(X, axis=1), np.nanvar(X, axis=1, ddof=1)
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _row_stats(X):
+        # NaN-aware per-row count, mean and variance (ddof=1) in one pass over each row
+        rows, cols = X.shape
+        count = np.zeros(rows, np.int64)
+        mean = np.full(rows, np.nan)
+        var = np.full(rows, np.nan)
+        for i in range(rows):
+            n = 0
+            total = 0.0
+            for j in range(cols):
+                if not np.isnan(X[i, j]):
+                    n += 1
+                    total += X[i, j]
+            count[i] = n
+            if n > 0:
+                mean[i] = total / n
+            if n > 1:
+                ss = 0.0
+                for j in range(cols):
+                    if not np.isnan(X[i, j]):
+                        ss += (X[i, j] - mean[i])**2
+                var[i] = ss / (n - 1)
+        return count, mean, var
+else:
+    _row_stats = _row_stats_numpy
 
+# ---- Preprocessing / Filtering ----
 def filter_and_annotate(df, condA, condB, species_map, thresholds):
-    df = df.copy()
-    df['Species'] = df.apply(assign_species, axis=1, species_suffixes=species_map)
-    df = df[~df['Species'].eq('MIXED')]
-    quant_mask = (
-        df[condA].notna().sum(axis=1) >= thresholds['min_valid'] and
-        df[condB].notna().sum(axis=1) >= thresholds['min_valid']
+    # One regex scan over the names: the first species suffix found in a name wins, else MIXED
+    pattern = '(' + '|'.join(map(re.escape, species_map.values())) + ')'
+    suffix_to_species = {suf: sp for sp, suf in species_map.items()}
+    species = (
+        df['Protein.Names'].str.extract(pattern, expand=False)
+        .map(suffix_to_species).fillna('MIXED').to_numpy()
     )
-    df = df[quant_mask]
-    df['CV_A'] = df[condA].std(axis=1) / df[condA].mean(axis=1)
-    df['CV_B'] = df[condB].std(axis=1) / df[condB].mean(axis=1)
-    cv_mask = (df['CV_A'] <= thresholds['cv_cutoff']) & (df['CV_B'] <= thresholds['cv_cutoff'])
-    return df[cv_mask]
+    # One column take for both groups; A and B are views into it
+    X = df[condA + condB].to_numpy(dtype=np.float64)
+    nA, muA, varA = _row_stats(X[:, :len(condA)])
+    nB, muB, varB = _row_stats(X[:, len(condA):])
+    quant_mask = (nA >= thresholds['min_valid']) & (nB >= thresholds['min_valid'])
+    # Rows with fewer than two values get a NaN CV and fail the cutoff below
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cvA = np.sqrt(varA) / muA
+        cvB = np.sqrt(varB) / muB
+    cv_mask = (cvA <= thresholds['cv_cutoff']) & (cvB <= thresholds['cv_cutoff'])
+    keep = (species != 'MIXED') & quant_mask & cv_mask
+    return df.loc[keep].assign(Species=species[keep], CV_A=cvA[keep], CV_B=cvB[keep])
 
 def add_log2(df, condA, condB):
-    df = df.copy()
-    for col in condA+condB:
-        if not col.startswith("log2_"):
-            if (df[col] > 0).all():
-                df[f'log2_{col}'] = np.log2(df[col])
-    return df
+    cols = [c for c in condA+condB if not c.startswith("log2_")]
+    M = df[cols].to_numpy(dtype=np.float32, copy=True)
+    # Non-positive intensities have no log; treat them as missing values
+    M[~(M > 0)] = np.nan
+    np.log2(M, out=M)
+    log2 = pd.DataFrame(M, index=df.index, columns=[f'log2_{c}' for c in cols])
+    return pd.concat([df, log2], axis=1)
 
 def diffexp(df, condA, condB, fc_thresh, alpha):
-    l2a = df[[f'log2_{c}' for c in condA]].values
-    l2b = df[[f'log2_{c}' for c in condB]].values
-    t_pvals = [ttest_ind(a, b, equal_var=False, nan_policy='omit')[1] for a,b in zip(l2a, l2b)]
-    l2fc = l2a.mean(axis=1) - l2b.mean(axis=1)
-    df['log2FC'] = l2fc
-    df['pval'] = t_pvals
-    df['signif'] = (np.abs(df['log2FC']) >= fc_thresh) & (df['pval'] <= alpha)
-    df['regulation'] = np.where(df['log2FC'] >= fc_thresh, 'UP',
-                        np.where(df['log2FC'] <= -fc_thresh, 'DOWN', 'NS'))
-    return df
+    L = df[[f'log2_{c}' for c in condA + condB]].to_numpy(dtype=np.float64)
+    l2a, l2b = L[:, :len(condA)], L[:, len(condA):]
+    # Welch's t-test for all rows at once, equivalent to per-row
+    # ttest_ind(equal_var=False, nan_policy='omit')
+    na, ma, va = _row_stats(l2a)
+    nb, mb, vb = _row_stats(l2b)
+    with warnings.catch_warnings():
+        # Rows with fewer than two values per group get a NaN p-value
+        warnings.simplefilter('ignore', RuntimeWarning)
+        sa = va / na
+        sb = vb / nb
+        t = (mb - ma) / np.sqrt(sa + sb)
+        dof = (sa + sb)**2 / (sa**2 / (na - 1) + sb**2 / (nb - 1))
+        t_pvals = 2 * t_dist.sf(np.abs(t), dof)
+    # B over A, matching the sign of the expected per-species log2FC
+    l2fc = mb - ma
+    # 1 = UP, -1 = DOWN, 0 = NS; -1 indexes the last label
+    reg_code = np.where(l2fc >= fc_thresh, 1, np.where(l2fc <= -fc_thresh, -1, 0))
+    signif = (np.abs(l2fc) >= fc_thresh) & (t_pvals <= alpha)
+    return df.assign(
+        log2FC=l2fc,
+        pval=t_pvals,
+        signif=signif,
+        regulation=np.array(['NS', 'UP', 'DOWN'])[reg_code],
+    )
 
 # ---- Summary/QC/Benchmark Metrics ----
 def compute_metrics(df, species_params):
     stats = {}
     deFDR = (df['Species'] != df['regulation']).mean() * 100 if "regulation" in df else np.nan
-    mean_cv = np.nanmean(np.r_[df['CV_A'], df['CV_B']]) * 100
+    # Both CV columns have one value per row, so this equals the mean of their concatenation
+    mean_cv = 0.5 * (np.nanmean(df['CV_A'].to_numpy()) + np.nanmean(df['CV_B'].to_numpy())) * 100
     asym = np.abs(df['log2FC']).median() / (np.abs(df['log2FC']).mean() + 1e-6)
     stats['deFDR'] = deFDR
     stats['mean_CV'] = mean_cv
     stats['asymmetry'] = asym
     # TP / FP / FN, sensitivity, specificity – demo only
     expected_up = [sp for sp,fc in species_params.items() if fc>0]
-    tp = sum((df['regulation']=='UP') & df['Species'].isin(expected_up))
-    fp = sum((df['regulation']=='UP') & ~df['Species'].isin(expected_up))
-    fn = sum((df['regulation']=='DOWN') & df['Species'].isin(expected_up))
+    reg = df['regulation'].to_numpy()
+    up_expected = np.isin(df['Species'].to_numpy(), expected_up)
+    is_up = reg == 'UP'
+    # Plain ints so the stats dict stays JSON-serialisable for the export
+    tp = int(np.count_nonzero(is_up & up_expected))
+    fp = int(np.count_nonzero(is_up & ~up_expected))
+    fn = int(np.count_nonzero((reg == 'DOWN') & up_expected))
     sens = tp/(tp+fn+1e-6)
     spec = tp/(tp+fp+1e-6)
     stats.update(dict(TP=tp, FP=fp, FN=fn, Sensitivity=sens, Specificity=spec))
@@ -121,6 +225,69 @@ def pass_fail(stats):
         "asymmetry": 0.5 <= stats["asymmetry"] <= 2.0,
     }
 
+# ---- Cached Analysis ----
+# DataFrame arguments are underscore-prefixed so Streamlit does not hash them on
+# every rerun; the small data_key / analysis_key arguments identify them instead.
+@st.cache_data(show_spinner=False, max_entries=8)
+def run_analysis(data_key, _df, condA, condB, min_valid, cv_cut, fc_thresh, alpha, species_params):
+    thresholds = dict(min_valid=min_valid, cv_cutoff=cv_cut/100)
+    species_map = {"HUMAN":"HUMAN","YEAST":"YEAST","ECOLI":"ECOLI","CELEGANS":"CELEGANS"}
+    dff = filter_and_annotate(_df, condA, condB, species_map, thresholds)
+    dff = add_log2(dff, condA, condB)
+    dff = diffexp(dff, condA, condB, fc_thresh, alpha)
+    return dff, compute_metrics(dff, json.loads(species_params))
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def results_figures(analysis_key, _dff):
+    fig1 = px.scatter(volcano_points(_dff), x='log2FC', y='pval', color='Species', title="log2FC vs p-value (Volcano)")
+    fig2 = histogram_figure(_dff['CV_A'].to_numpy(), 30, "CV Distribution A", "CV_A")
+    fig3 = density_figure(_dff['log2FC'].to_numpy(), _dff['pval'].to_numpy(), "log2FC Density vs p-value", "log2FC", "pval")
+    return fig1, fig2, fig3
+
+# ---- Plots ----
+# Plotly ships one JSON point per row; bin or subsample before handing data to the browser
+MAX_SCATTER_POINTS = 5000
+
+def volcano_points(df, max_points=MAX_SCATTER_POINTS):
+    # Keep every significant protein, subsample the rest
+    signif = df['signif'].to_numpy()
+    ns = np.flatnonzero(~signif)
+    if ns.size <= max_points:
+        return df
+    keep = signif.copy()
+    keep[np.random.default_rng(0).choice(ns, max_points, replace=False)] = True
+    return df[keep]
+
+def histogram_figure(values, nbins, title, xaxis_title):
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=nbins)
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title="count", bargap=0)
+    return fig
+
+def density_figure(x, y, title, xaxis_title, yaxis_title, nbins=100):
+    ok = np.isfinite(x) & np.isfinite(y)
+    H, xedges, yedges = np.histogram2d(x[ok], y[ok], bins=nbins)
+    fig = go.Figure(go.Contour(
+        z=H.T, x=(xedges[:-1] + xedges[1:]) / 2, y=(yedges[:-1] + yedges[1:]) / 2,
+        contours_coloring='lines', showscale=False,
+    ))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title)
+    return fig
+
+# ---- Export ----
+@st.fragment
+def export_results(dff, stats, config):
+    # Runs as a fragment so the export buttons rerun only this block, not the pipeline
+    export_btn = st.button("Download Full Results")
+    if export_btn:
+        out_bytes = zip_results({
+            "quant_results.tsv": dff,
+            "dashboard_stats.json": json.dumps(stats, indent=2),
+            "config.yaml": save_config(config),
+        })
+        st.download_button("Results.zip", out_bytes, "BenchmarkResults.zip")
+
 # ---- Main Streamlit App ----
 st.set_page_config('Proteomics Benchmark', layout='wide')
 st.title("Multi-Species Proteomics Workflow Benchmarking App")
@@ -134,83 +301,107 @@ with st.expander("Show CITATION"):
         "Jumel, T. & Shevchenko, A. Multispecies Benchmark Analysis for LC-MSMS Validation and Performance Evaluation in Bottom-Up Proteomics. J. Proteome Res. 2024; see README for other references."
     )
 
-tab1, tab2, tab3 = st.tabs(["Data", "Parameters", "Results"])
+# Only the selected page is built; st.tabs would run every tab body (including
+# the full analysis) on each rerun even though one tab is visible.
+PAGES = ["Data", "Parameters", "Results"]
+PARAM_DEFAULTS = dict(
+    demo=False, folder="", condA=[], condB=[], min_valid=2, cv_cut=20, fc_thresh=1, alpha=0.01,
+    species_json='{"HUMAN":0,"YEAST":1,"ECOLI":-2,"CELEGANS":-1}',
+)
+for key, value in PARAM_DEFAULTS.items():
+    st.session_state.setdefault(key, value)
+    # Re-assigning keeps the value of widgets that are not rendered on the current page
+    st.session_state[key] = st.session_state[key]
+
+demo = st.session_state.demo
+folder = st.session_state.folder
+
+# data_key identifies the loaded matrix for the cached analysis without hashing it
+pg = pr = df = data_key = None
+if demo:
+    data_key = ("demo",)
+    df = generate_synthetic_data(st.session_state.get("species_params", {"HUMAN":0,"YEAST":1,"ECOLI":-2}))
+elif folder:
+    pg, pr = find_matrix_files(folder)
+    if pg:
+        data_key = (str(pg), pg.stat().st_mtime)
+        df = read_matrix(*data_key)
 
-with tab1:
+# Stored selections outlive the matrix they were picked from: drop columns this one lacks
+if df is not None:
+    for key in ("condA", "condB"):
+        st.session_state[key] = [c for c in st.session_state[key] if c in df.columns]
+# ... and a stored min_valid may exceed the slider range of a smaller selection
+max_valid = max(len(st.session_state.condA), 2)
+st.session_state.min_valid = min(st.session_state.min_valid, max_valid)
+
+condA, condB = st.session_state.condA, st.session_state.condB
+min_valid, cv_cut = st.session_state.min_valid, st.session_state.cv_cut
+fc_thresh, alpha = st.session_state.fc_thresh, st.session_state.alpha
+species_params = st.session_state.species_json
+
+page = st.radio("Step", PAGES, horizontal=True, label_visibility="collapsed", key="page")
+
+if page == "Data":
     st.header("Step 1: Data Ingestion")
-    demo = st.checkbox("Demo Mode: Use synthetic test data")
-    folder = None
+    st.checkbox("Demo Mode: Use synthetic test data", key="demo")
     if not demo:
-        folder = st.text_input("Path to DIA-NN results folder")
-        if folder:
-            pg, pr = find_matrix_files(folder)
-            if pg:
-                st.success(f"Protein Group matrix found: {pg.name}")
-            if pr:
-                st.info(f"Precursor matrix found: {pr.name}")
+        st.text_input("Path to DIA-NN results folder", key="folder")
+        if pg:
+            st.success(f"Protein Group matrix found: {pg.name}")
+        if pr:
+            st.info(f"Precursor matrix found: {pr.name}")
     else:
         st.info("Synthetic example data enabled.")
-    if demo or (folder and pg):
-        if demo:
-            species_params = st.session_state.get("species_params", {"HUMAN":0,"YEAST":1,"ECOLI":-2})
-            df = generate_synthetic_data(species_params)
-        else:
-            df = read_matrix(pg)
+    if df is not None:
         st.dataframe(df.head(20))
 
-with tab2:
+elif page == "Parameters":
     st.header("Step 2: Assign Samples & Set Parameters")
-    all_cols = df.columns.tolist()
-    condA = st.multiselect("Group A sample columns", [c for c in all_cols if c.startswith("A")])
-    condB = st.multiselect("Group B sample columns", [c for c in all_cols if c.startswith("B")])
-    min_valid = st.slider("Min valid values/group", 1, len(condA), 2)
-    cv_cut = st.slider("Max CV %", 1, 50, 20)
-    fc_thresh = st.slider("Log2 FC threshold", 0, 4, 1)
-    alpha = st.number_input("Significance level (alpha)", 0.001, 0.2, 0.01)
-    species_params = st.text_area(
-        "Expected log2FC by species (JSON)", 
-        '{"HUMAN":0,"YEAST":1,"ECOLI":-2,"CELEGANS":-1}'
-    )
-    if st.button("Save Params/Config"):
-        st.download_button(
-            "Download config",
-            save_config(dict(condA=condA, condB=condB, min_valid=min_valid, cv_cut=cv_cut, fc_thresh=fc_thresh, alpha=alpha, species_params=json.loads(species_params))),
-            "config.yaml"
-        )
-
-with tab3:
+    if df is None:
+        st.info("Load a DIA-NN results folder or enable Demo Mode on the Data page first.")
+    else:
+        all_cols = df.columns.tolist()
+        # Group selections stay outside the form: the min_valid range depends on them
+        st.multiselect("Group A sample columns", [c for c in all_cols if c.startswith("A")], key="condA")
+        st.multiselect("Group B sample columns", [c for c in all_cols if c.startswith("B")], key="condB")
+        # A form commits all threshold edits in one rerun instead of one per widget change
+        with st.form("params"):
+            st.slider("Min valid values/group", 1, max_valid, key="min_valid")
+            st.slider("Max CV %", 1, 50, key="cv_cut")
+            st.slider("Log2 FC threshold", 0, 4, key="fc_thresh")
+            st.number_input("Significance level (alpha)", 0.001, 0.2, key="alpha")
+            st.text_area("Expected log2FC by species (JSON)", key="species_json")
+            st.form_submit_button("Apply parameters")
+        if st.button("Save Params/Config"):
+            st.download_button(
+                "Download config",
+                save_config(dict(condA=condA, condB=condB, min_valid=min_valid, cv_cut=cv_cut, fc_thresh=fc_thresh, alpha=alpha, species_params=json.loads(species_params))),
+                "config.yaml"
+            )
+
+else:
     st.header("Step 3: Analyze and Benchmark")
     # Only proceed if columns are assigned etc.
-    if condA and condB:
+    if df is not None and condA and condB and set(condA + condB).issubset(df.columns):
         # Preprocess
-        thresholds = dict(min_valid=min_valid, cv_cutoff=cv_cut/100)
-        species_map = {"HUMAN":"HUMAN","YEAST":"YEAST","ECOLI":"ECOLI","CELEGANS":"CELEGANS"}
-        dff = filter_and_annotate(df, condA, condB, species_map, thresholds)
-        dff = add_log2(dff, condA, condB)
-        dff = diffexp(dff, condA, condB, fc_thresh, alpha)
-        stats = compute_metrics(dff, json.loads(species_params))
+        analysis_key = (data_key, tuple(condA), tuple(condB), min_valid, cv_cut, fc_thresh, alpha, species_params)
+        dff, stats = run_analysis(data_key, df, condA, condB, min_valid, cv_cut, fc_thresh, alpha, species_params)
         pf = pass_fail(stats)
         # Dashboard
         st.subheader("Summary Dashboard")
-        st.markdown(f"- deFDR: {stats['deFDR']:.2f} {'✅' if pf['deFDR'] else '❌'}")
-        st.markdown(f"- mean CV: {stats['mean_CV']:.2f} {'✅' if pf['mean CV'] else '❌'}")
-        st.markdown(f"- Asymmetry: {stats['asymmetry']:.3f} {'✅' if pf['asymmetry'] else '❌'}")
-        st.markdown(f"- TP: {stats['TP']} | FP: {stats['FP']} | FN: {stats['FN']} | Sensitivity: {stats['Sensitivity']:.2f} | Specificity: {stats['Specificity']:.2f}")
+        st.markdown("\n".join([
+            f"- deFDR: {stats['deFDR']:.2f} {'✅' if pf['deFDR'] else '❌'}",
+            f"- mean CV: {stats['mean_CV']:.2f} {'✅' if pf['mean CV'] else '❌'}",
+            f"- Asymmetry: {stats['asymmetry']:.3f} {'✅' if pf['asymmetry'] else '❌'}",
+            f"- TP: {stats['TP']} | FP: {stats['FP']} | FN: {stats['FN']} | Sensitivity: {stats['Sensitivity']:.2f} | Specificity: {stats['Specificity']:.2f}",
+        ]))
 
         # Plots
-        fig1 = px.scatter(dff, x='log2FC', y='pval', color='Species', title="log2FC vs p-value (Volcano)")
-        fig2 = px.histogram(dff, x='CV_A', nbins=30, title="CV Distribution A")
-        fig3 = px.density_contour(dff, x='log2FC', y='pval', title="log2FC Density vs p-value")
+        fig1, fig2, fig3 = results_figures(analysis_key, dff)
         st.plotly_chart(fig1, use_container_width=True)
         st.plotly_chart(fig2, use_container_width=True)
         st.plotly_chart(fig3, use_container_width=True)
         st.dataframe(dff.head(40))
 
-        export_btn = st.button("Download Full Results")
-        if export_btn:
-            out_bytes = zip_results({
-                "quant_results.tsv": dff.to_csv(sep="\t", index=False),
-                "dashboard_stats.json": json.dumps(stats, indent=2),
-                "config.yaml": save_config(dict(condA=condA, condB=condB, min_valid=min_valid, cv_cut=cv_cut, fc_thresh=fc_thresh, alpha=alpha, species_params=species_params)),
-            })
-            st.download_button("Results.zip", out_bytes, "BenchmarkResults.zip")
+        export_results(dff, stats, dict(condA=condA, condB=condB, min_valid=min_valid, cv_cut=cv_cut, fc_thresh=fc_thresh, alpha=alpha, species_params=species_params))